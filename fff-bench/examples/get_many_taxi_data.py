@@ -1,24 +1,31 @@
 import pyarrow.parquet as pq
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 PREFIX = "https://d37ci6vzurychx.cloudfront.net/trip-data/"
 files = ["yellow_tripdata_2024-06.parquet","yellow_tripdata_2024-07.parquet", "yellow_tripdata_2024-08.parquet"]
 os.makedirs("../data", exist_ok=True)
 
-# Download files
-for file in files:
+# Download files concurrently, streaming each response body to disk
+def download(file):
     url = PREFIX + file
-    response = requests.get(url)
-    if response.status_code == 200:
-        with open(f"../data/{file}", "wb") as f:
-            f.write(response.content)
-        print(f"Downloaded {file}")
-    else:
-        print(f"Failed to download {file}")
-    
+    with requests.get(url, stream=True) as response:
+        if response.status_code == 200:
+            with open(f"../data/{file}", "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+            print(f"Downloaded {file}")
+        else:
+            print(f"Failed to download {file}")
 
-schema = pq.ParquetFile("../data/"+files[0]).schema_arrow
+with ThreadPoolExecutor(max_workers=len(files)) as executor:
+    list(executor.map(download, files))
+
+# Combine files; the first file is opened once for both its schema and its data
+first = pq.ParquetFile("../data/"+files[0], memory_map=True, pre_buffer=True)
+schema = first.schema_arrow
 with pq.ParquetWriter("../data/combined.parquet", schema=schema) as writer:
-    for file in files:
-        writer.write_table(pq.read_table("../data/"+file, schema=schema))
\ No newline at end of file
+    writer.write_table(first.read(use_threads=True))
+    for file in files[1:]:
+        writer.write_table(pq.read_table("../data/"+file, schema=schema, use_threads=True, memory_map=True, pre_buffer=True))
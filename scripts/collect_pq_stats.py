@@ -1,86 +1,164 @@
-import subprocess
 import json
 import os
+import pickle
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-def run_command(command):
-    """Run a shell command and return its output. Handle errors gracefully."""
+import pyarrow.parquet as pq
+
+CACHE_PATH = "parquet_analysis_cache.pkl"
+# Bump whenever extract_metadata/extract_layout_info change what they produce, so cached entries
+# computed by an older version of this script are discarded instead of reused
+CACHE_VERSION = 4
+
+def read_metadata(parquet_file):
+    """Read only the footer metadata of a parquet file; no column data is touched. Handle errors gracefully."""
     try:
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=True)
-        if result.returncode != 0:
-            print(f"Command failed: {command}")
-            print(f"Error: {result.stderr}")
-            return None
-        return result.stdout
+        return pq.read_metadata(parquet_file, memory_map=True)
     except Exception as e:
-        print(f"Exception occurred while running command: {command}")
+        print(f"Exception occurred while reading metadata: {parquet_file}")
         print(f"Exception: {str(e)}")
         return None
 
-def extract_metadata(output):
-    """Extract 'version' and 'created by' from the parquet-schema output."""
-    metadata = {}
-    for line in output.splitlines():
-        if line.startswith("version:"):
-            metadata["version"] = line.split(":")[1].strip()
-        elif line.startswith("created by:"):
-            metadata["created_by"] = line.split(":")[1].strip()
-    return metadata
-
-def extract_layout_info(output):
-    """Extract unique 'encoding', 'page_type', and 'compression' from the parquet-layout output."""
-    layout_info = defaultdict(set)
-    try:
-        data = json.loads(output)
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse JSON output: {e}")
+def extract_metadata(metadata):
+    """Extract 'version' and 'created by' from the file metadata.
+
+    PyArrow reports the format version as "1.0"/"2.6"; only the major version is stored in the
+    footer, so it is reported as "1"/"2" like parquet-schema does.
+    """
+    return {
+        "version": str(int(float(metadata.format_version))),
+        "created_by": metadata.created_by,
+    }
+
+def compression_name(compression):
+    """Map a PyArrow compression name to the parquet-layout one (None when uncompressed)."""
+    if compression == "UNCOMPRESSED":
         return None
-    
-    for row_group in data.get("row_groups", []):
-        for column in row_group.get("columns", []):
-            for page in column.get("pages", []):
-                layout_info["encoding"].add(page.get("encoding"))
-                layout_info["page_type"].add(page.get("page_type"))
-                layout_info["compression"].add(page.get("compression"))
-    
+    # PyArrow names the LZ4_RAW codec "LZ4". It has no name for the deprecated Hadoop-framed LZ4
+    # codec and reports it as "UNKNOWN"; every other codec of a valid Parquet file has a name
+    return {"LZ4": "lz4_raw", "UNKNOWN": "lz4"}.get(compression, compression.lower())
+
+def extract_layout_info(metadata):
+    """Extract unique 'encoding' and 'compression' from the column chunk metadata.
+
+    Values use the parquet-layout vocabulary (lower-case names, None for uncompressed), but page
+    headers are not part of the footer, so the output is not fully comparable with results produced
+    by parquet-layout (e.g. results/parquet_analysis.json):
+    - 'page_type' is not reported. The footer does not record whether data pages are v1 or v2, and
+      a made-up value would not match anything parquet-layout produces.
+    - The chunk encodings also list the encodings of repetition/definition levels. BIT_PACKED is only
+      ever used for levels and is dropped, and RLE is dropped for every type except BOOLEAN (the
+      one type whose values can be RLE-encoded). A nullable BOOLEAN column therefore reports "rle"
+      from its levels even when its data pages are plain, where parquet-layout would not.
+    """
+    layout_info = defaultdict(set)
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            for encoding in column.encodings:
+                if encoding == "BIT_PACKED" or (encoding == "RLE" and column.physical_type != "BOOLEAN"):
+                    continue
+                layout_info["encoding"].add(encoding.lower())
+            layout_info["compression"].add(compression_name(column.compression))
+
     # Convert sets to lists for JSON serialization
     for key in layout_info:
         layout_info[key] = list(layout_info[key])
-    
+
     return layout_info
 
+def analyze(parquet_file):
+    """Collect metadata and layout info for one parquet file. Returns None if metadata extraction fails."""
+    print(f"Processing {parquet_file}...")
+    file_info = {}
+
+    metadata = read_metadata(parquet_file)
+    if metadata is None:
+        print(f"Skipping metadata extraction for {parquet_file} due to errors.")
+        return parquet_file, None
+
+    file_info.update(extract_metadata(metadata))
+    file_info.update(extract_layout_info(metadata))
+
+    return parquet_file, file_info
+
+def load_cache():
+    """Load the (path, mtime_ns, size) -> file_info cache from a previous run, if any."""
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            cache = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Ignoring unreadable cache {CACHE_PATH}: {str(e)}")
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        print(f"Ignoring cache {CACHE_PATH} written by a different version of this script.")
+        return {}
+    return cache["entries"]
+
+def save_cache(cache):
+    """Persist the cache atomically so an interrupted run never leaves a truncated file behind."""
+    tmp_path = CACHE_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": CACHE_VERSION, "entries": cache}, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+def write_results(results, path):
+    """Write results one file entry at a time; the output matches json.dump(results, f, indent=4)."""
+    with open(path, "w") as f:
+        if not results:
+            f.write("{}")
+            return
+        f.write("{")
+        separator = "\n    "
+        for parquet_file, file_info in results.items():
+            f.write(separator)
+            f.write(json.dumps(parquet_file))
+            f.write(": ")
+            f.write(json.dumps(file_info, indent=4).replace("\n", "\n    "))
+            separator = ",\n    "
+        f.write("\n}")
+
 def main():
-    parquet_files = [f for f in os.listdir() if f.endswith('.parquet')]
+    entries = [e for e in os.scandir() if e.name.endswith('.parquet') and e.is_file()]
+    parquet_files = [e.name for e in entries]
     results = {}
 
-    for parquet_file in parquet_files:
-        print(f"Processing {parquet_file}...")
-        file_info = {}
-
-        # Extract metadata using parquet-schema
-        schema_output = run_command(f"parquet-schema {parquet_file}")
-        if schema_output:
-            file_info.update(extract_metadata(schema_output))
-        else:
-            print(f"Skipping metadata extraction for {parquet_file} due to errors.")
-            continue  # Skip to the next file if metadata extraction fails
-
-        # Extract layout info using parquet-layout
-        layout_output = run_command(f"parquet-layout {parquet_file}")
-        if layout_output:
-            layout_info = extract_layout_info(layout_output)
-            if layout_info:
-                file_info.update(layout_info)
-            else:
-                print(f"Skipping layout extraction for {parquet_file} due to JSON parsing errors.")
+    # Reuse footer info for files that have not changed since the last run
+    cache = load_cache()
+    new_cache = {}
+    keys = {}
+    misses = []
+    for entry in entries:
+        parquet_file = entry.name
+        st = entry.stat()
+        key = (parquet_file, st.st_mtime_ns, st.st_size)
+        keys[parquet_file] = key
+        if key in cache:
+            new_cache[key] = cache[key]
         else:
-            print(f"Skipping layout extraction for {parquet_file} due to command errors.")
+            misses.append(parquet_file)
+
+    # Files are independent, so analyze them in parallel
+    if misses:
+        with ProcessPoolExecutor() as executor:
+            for parquet_file, file_info in executor.map(analyze, misses):
+                if file_info is not None:
+                    new_cache[keys[parquet_file]] = file_info
+
+    for parquet_file in parquet_files:
+        file_info = new_cache.get(keys[parquet_file])
+        if file_info is not None:
+            results[parquet_file] = file_info
 
-        results[parquet_file] = file_info
+    # Entries for deleted or modified files are dropped
+    save_cache(new_cache)
 
     # Save results to a JSON file
-    with open("parquet_analysis.json", "w") as f:
-        json.dump(results, f, indent=4)
+    write_results(results, "parquet_analysis.json")
 
     print("Analysis complete. Results saved to parquet_analysis.json.")
 
@@ -5,11 +5,11 @@ import duckdb
 # Connect to DuckDB (using an in-memory database here)
 con = duckdb.connect()
 
-# Read the Parquet file, selecting only the first 8 columns
-df = con.execute("SELECT * FROM '/mnt/nvme0n1/xinyu/data/parquet/core.parquet' LIMIT 0").fetchdf()
-# first_9_columns = list(df.columns[0:8])
-# first_9_columns.extend(list(df.columns[12:20]))
-first_9_columns = df.columns[12]
+# Read only the schema of the Parquet file; DESCRIBE returns (name, type, ...) rows without running the scan
+columns = [row[0] for row in con.execute("DESCRIBE SELECT * FROM '/mnt/nvme0n1/xinyu/data/parquet/core.parquet'").fetchall()]
+# first_9_columns = list(columns[0:8])
+# first_9_columns.extend(list(columns[12:20]))
+first_9_columns = columns[12]
 
 # Write the selected columns to a new Parquet file
         # SELECT {', '.join(first_9_columns)}
@@ -3,18 +3,6 @@
 import pyarrow.parquet as pq
 import pyarrow as pa
 
-# Read the Parquet file
-table = pq.read_table("/mnt/nvme0n1/xinyu/laion/parquet/merged_8M.parquet")
-
-# Extract the Map column
-map_column = table.column("exif")
-
-# Convert Map to List of Struct
-struct_list = []
-for map_item in map_column:
-    if map_item is not None:
-        struct_list.append([{"key": k, "value": v} for [k, v] in map_item.as_py()])
-
 # Create a new schema with the List of Struct
 struct_schema = pa.list_(
     pa.struct([
@@ -23,15 +11,35 @@ struct_schema = pa.list_(
     ])
 )
 
-# Create a new Arrow array for the List of Struct
-struct_array = pa.array(struct_list, type=struct_schema)
-
-# Create a new table with the converted column
-new_table = table.set_column(
-    table.schema.get_field_index("exif"),
-    "list_of_struct",
-    struct_array
-)
-
-# Write the new table to a Parquet file
-pq.write_table(new_table, "/mnt/nvme0n1/xinyu/laion/parquet/merged_8M_new.parquet")
\ No newline at end of file
+def map_to_list_of_struct(map_array):
+    """Convert a MapArray into a List<Struct<key, value>> array without touching the data.
+
+    A Map is physically a List<Struct<key, value>>, so the offsets and the entries child are
+    reused as-is and only the logical type is swapped.
+    """
+    validity, offsets = map_array.buffers()[:2]
+    entries_type = struct_schema.value_type
+    if map_array.type.key_field.name == "key" and map_array.type.item_field.name == "value":
+        entries = map_array.values.cast(entries_type)
+    else:
+        # Struct casts match fields by name, so a Map with non-canonical entry names would come out
+        # all null; rebuild the entries from the key and item children instead (still no copy)
+        entries = pa.StructArray.from_arrays([map_array.keys, map_array.items], fields=list(entries_type))
+    return pa.Array.from_buffers(
+        struct_schema, len(map_array), [validity, offsets],
+        null_count=map_array.null_count, offset=map_array.offset, children=[entries]
+    )
+
+# Open the Parquet file; row groups are read one at a time to keep peak memory at one row group
+pf = pq.ParquetFile("/mnt/nvme0n1/xinyu/laion/parquet/merged_8M.parquet")
+exif_index = pf.schema_arrow.get_field_index("exif")
+
+# Create a new schema with the converted column
+new_schema = pf.schema_arrow.set(exif_index, pa.field("list_of_struct", struct_schema))
+
+# Convert the Map column of each row group and write it to a new Parquet file
+with pq.ParquetWriter("/mnt/nvme0n1/xinyu/laion/parquet/merged_8M_new.parquet", new_schema) as writer:
+    for i in range(pf.num_row_groups):
+        row_group = pf.read_row_group(i)
+        struct_array = map_to_list_of_struct(row_group.column(exif_index).combine_chunks())
+        writer.write_table(row_group.set_column(exif_index, "list_of_struct", struct_array))
@@ -20,8 +20,10 @@ for table in tables:
     pq.write_table(relation_as_arrow, f'{table}.parquet', compression='snappy', row_group_size=1048576)
     # duckdb table
     con.execute(f"COPY {table} TO '{table}_duckdb.parquet' (FORMAT PARQUET, COMPRESSION SNAPPY, ROW_GROUP_SIZE 1048576)")
-    con.execute(f'''-- Create a new table with the modified schema
-CREATE TABLE {table}_double AS
+
+# lineitem with DECIMAL columns as DOUBLE and DATE columns as INTEGER days since the epoch (the date32
+# value), written in a single pass straight from the generated table (no intermediate table or parquet re-read)
+con.execute('''COPY (
 SELECT
   l_orderkey,
   l_partkey,
@@ -33,16 +35,14 @@ SELECT
   CAST(l_tax AS DOUBLE) AS l_tax,
   l_returnflag,
   l_linestatus,
-  CAST(l_shipdate AS INTEGER) AS l_shipdate,
-  CAST(l_commitdate AS INTEGER) AS l_commitdate,
-  CAST(l_receiptdate AS INTEGER) AS l_receiptdate,
+  CAST(l_shipdate - DATE '1970-01-01' AS INTEGER) AS l_shipdate,
+  CAST(l_commitdate - DATE '1970-01-01' AS INTEGER) AS l_commitdate,
+  CAST(l_receiptdate - DATE '1970-01-01' AS INTEGER) AS l_receiptdate,
   l_shipinstruct,
   l_shipmode,
   l_comment
-FROM '{table}_duckdb.parquet';
-
--- Write the new data to a parquet file
-COPY {table}_double TO '{table}_double.parquet' (FORMAT PARQUET, COMPRESSION SNAPPY, ROW_GROUP_SIZE 1048576);''')
+FROM lineitem
+) TO 'lineitem_double.parquet' (FORMAT PARQUET, COMPRESSION SNAPPY, ROW_GROUP_SIZE 1048576)''')
 # Close the connection
 con.close()
 
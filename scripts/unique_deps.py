@@ -3,13 +3,17 @@
 # This script is used to extract the unique dependencies from the Cargo.toml and Cargo.lock files.
 # For a xxx project proposal.
 import sys
-import toml
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
 
 def main():
     # Load Cargo.toml
     try:
-        with open("Cargo.toml", "r") as f:
-            cargo_toml = toml.load(f)
+        with open("Cargo.toml", "rb") as f:
+            cargo_toml = tomllib.load(f)
     except Exception as e:
         sys.exit(f"Error reading Cargo.toml: {e}")
 
@@ -23,28 +27,38 @@ def main():
 
     # Load Cargo.lock
     try:
-        with open("Cargo.lock", "r") as f:
-            cargo_lock = toml.load(f)
+        with open("Cargo.lock", "rb") as f:
+            cargo_lock = tomllib.load(f)
     except Exception as e:
         sys.exit(f"Error reading Cargo.lock: {e}")
 
     # Set to hold unique git URLs
     git_urls = set()
 
+    # Workspace dependencies not yet seen in Cargo.lock
+    remaining = set(workspace_deps)
+
     # Iterate over packages in Cargo.lock
     for pkg in cargo_lock.get("package", []):
         name = pkg.get("name", "")
+        # Skip packages that are not workspace dependencies
+        if name not in workspace_deps:
+            # Cargo.lock is sorted by name, so every version of the last workspace dependency has
+            # been visited by now and no later package can match
+            if not remaining:
+                break
+            continue
+        remaining.discard(name)
         source = pkg.get("source", "")
-        # Check if this package is one of the workspace dependencies and has a git source
-        if name in workspace_deps:
-            if source.startswith("git+"):
-                # Extract the URL part (strip the "git+" prefix and remove the commit hash)
-                url = source.split("#")[0]
-                if url.startswith("git+"):
-                    url = url[len("git+"):]
-                git_urls.add(url)
-            elif source == "registry+https://github.com/rust-lang/crates.io-index":
-                git_urls.add(f"https://crates.io/crates/{name}")
+        # Check if this package has a git source
+        if source.startswith("git+"):
+            # Extract the URL part (strip the "git+" prefix and remove the commit hash)
+            url = source.split("#")[0]
+            if url.startswith("git+"):
+                url = url[len("git+"):]
+            git_urls.add(url)
+        elif source == "registry+https://github.com/rust-lang/crates.io-index":
+            git_urls.add(f"https://crates.io/crates/{name}")
                 
 
     # Output each unique git URL
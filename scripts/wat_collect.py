@@ -2,27 +2,29 @@
 
 import re
 
+FUNC_RE = re.compile(r'\(func (\$\S*)')
+
 def parse_wat_file(file_path):
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-    
     functions = {}
     current_function = None
     line_count = 0
 
-    for line in lines:
-        line = line.strip()
-        func_match = re.match(r'\(func (\$[^\s]*)', line)
-        
-        if func_match:
-            if current_function:
-                functions[current_function] = line_count
-
-            current_function = func_match.group(1)
-            line_count = 1  # Start line count for the new function
-        elif current_function:
-            if line != '':
-                line_count += 1
+    with open(file_path, 'r') as file:
+        for line in file:
+            # Trailing whitespace only matters for blank lines, which lstrip() already empties
+            line = line.lstrip()
+            # Cheap literal check first; most lines are function bodies and never need the regex
+            func_match = FUNC_RE.match(line) if line.startswith('(func') else None
+
+            if func_match:
+                if current_function:
+                    functions[current_function] = line_count
+
+                current_function = func_match.group(1)
+                line_count = 1  # Start line count for the new function
+            elif current_function:
+                if line != '':
+                    line_count += 1
 
     if current_function:
         functions[current_function] = line_count